@@ -5,8 +5,10 @@ This module defines the database schema for storing court cases and hearings
 from Nepal's court system (district, high, supreme, and special courts).
 """
 
+import json
 import os
 from datetime import datetime
+from functools import partial
 from sqlalchemy import Column, String, Date, DateTime, Text, Integer, ForeignKey, create_engine, Index
 from sqlalchemy.orm import relationship, declarative_base, sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB
@@ -406,12 +408,16 @@ Index('idx_scraped_date_unique',
 
 # Database connection helpers
 
+# JSONB values are sent as compact UTF-8 JSON; the default ensure_ascii=True encoding
+# turns every Devanagari character into a 6-byte \uXXXX escape
+_json_serializer = partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+
 # Global engine instance (singleton pattern)
 _engine = None
 _engine_url = None
 
 
-def get_engine(database_url=None):
+def get_engine(database_url=None, **engine_options):
     """
     Get or create database engine (singleton pattern).
     
@@ -420,6 +426,9 @@ def get_engine(database_url=None):
     
     Args:
         database_url: PostgreSQL connection string. If None, reads from DATABASE_URL env var.
+        **engine_options: Extra create_engine() keyword arguments (e.g. pool_size).
+            Only used by the call that creates the engine. json_serializer defaults
+            to compact, non-ASCII-escaping json.dumps.
         
     Returns:
         SQLAlchemy engine instance
@@ -451,18 +460,20 @@ def get_engine(database_url=None):
         return _engine
     
     # Create new engine
-    _engine = create_engine(database_url, echo=False)
+    engine_options.setdefault('json_serializer', _json_serializer)
+    _engine = create_engine(database_url, echo=False, **engine_options)
     _engine_url = database_url
     
     return _engine
 
 
-def get_session(engine):
+def get_session(engine, **session_options):
     """
     Create database session with explicit transaction control.
     
     Args:
         engine: SQLAlchemy engine instance
+        **session_options: Extra sessionmaker() keyword arguments (e.g. autoflush=False).
         
     Returns:
         SQLAlchemy session instance
@@ -478,7 +489,7 @@ def get_session(engine):
         # Close when done
         session.close()
     """
-    Session = sessionmaker(bind=engine, autobegin=False)
+    Session = sessionmaker(bind=engine, autobegin=False, **session_options)
     return Session()
 
 
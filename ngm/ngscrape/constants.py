@@ -5,4 +5,13 @@ SCRAPE_LOOKBACK_DAYS = 10 * 365  # How many days back to scrape
 SCRAPE_OFFSET_DAYS = 2  # Days to offset from today (to avoid incomplete data)
 
 SCRAPE_LOOKBACK_DAYS_SUPREME_COURT = 15 * 365
-SCRAPE_LOOKBACK_DAYS_SPECIAL_COURT = 15 * 365
\ No newline at end of file
+SCRAPE_LOOKBACK_DAYS_SPECIAL_COURT = 15 * 365
+
+# Number of enriched cases buffered before writing to the database
+ENRICHMENT_BATCH_SIZE = 1000
+
+# Number of candidate cases fetched per page (one short transaction each) by enrichment queries
+ENRICHMENT_QUERY_CHUNK_SIZE = 5000
+
+# Number of cause list hearings buffered before writing to the database
+CAUSE_LIST_BATCH_SIZE = 1000
@@ -0,0 +1,26 @@
+import scrapy
+
+
+class EnrichedCaseItem(scrapy.Item):
+    """Enrichment data parsed from a case detail page."""
+    case_number = scrapy.Field()
+    court_identifier = scrapy.Field()
+    enrichment_data = scrapy.Field()
+    entities = scrapy.Field()
+    hearings_timeline = scrapy.Field()
+
+
+class FailedCaseItem(scrapy.Item):
+    """A case whose detail page could not be fetched or did not contain the case."""
+    case_number = scrapy.Field()
+    court_identifier = scrapy.Field()
+
+
+class CauseListItem(scrapy.Item):
+    """Cases and hearings listed on one high court bench for a date."""
+    court_identifier = scrapy.Field()
+    date_bs = scrapy.Field()
+    bench_id = scrapy.Field()  # None when the date has no benches
+    cases = scrapy.Field()  # CourtCase column dicts, one per hearing
+    hearings = scrapy.Field()  # CourtCaseHearing column dicts
+    bench_count = scrapy.Field()  # Set on the item that completes the date, which marks it scraped
@@ -1,4 +1,67 @@
+import csv
+import io
+import logging
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pytz
 from scrapy.pipelines.files import FilesPipeline
+from scrapy.utils.defer import maybe_deferred_to_future
+from sqlalchemy import bindparam, delete, func, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from twisted.internet.defer import DeferredLock
+from twisted.internet.threads import deferToThread
+
+from ngm.database.models import get_engine, get_session, CourtCase, CourtCaseHearing, CaseEntity
+from ngm.ngscrape.constants import CAUSE_LIST_BATCH_SIZE, ENRICHMENT_BATCH_SIZE
+from ngm.ngscrape.items import CauseListItem, EnrichedCaseItem, FailedCaseItem
+from ngm.utils.db_helpers import mark_date_scraped, save_cases_and_hearings
+
+KATHMANDU_TZ = pytz.timezone('Asia/Kathmandu')
+
+logger = logging.getLogger(__name__)
+
+# CaseEntity columns written by COPY, in CSV column order
+_ENTITY_COPY_COLUMNS = ('case_number', 'court_identifier', 'side', 'name', 'address', 'created_at', 'updated_at')
+
+# "<year> <month> भाग <volume> अंक <issue> - <file id>.pdf"
+KANUN_PATRIKA_PATH_TEMPLATE = "{year} {month} भाग {volume} अंक {issue} - {file_id}.pdf"
+
+# Current status for a batch of (case_number, court_identifier) keys.
+# Built once; the key list is bound per batch.
+_SELECT_CASES_STMT = select(
+    CourtCase.case_number,
+    CourtCase.court_identifier,
+    CourtCase.status
+).where(
+    tuple_(CourtCase.case_number, CourtCase.court_identifier).in_(bindparam('keys', expanding=True))
+)
+
+# CourtCase columns filled from the detail page; each is only overwritten when the page had a value
+_ENRICHMENT_FIELDS = ('registration_number', 'case_status', 'verdict_date_bs', 'verdict_date_ad', 'verdict_judge')
+
+# Executed as an executemany with one parameter set per case; that is a single
+# round trip per batch only with the psycopg2 dialect's
+# executemany_mode='values_plus_batch' (set by the enrichment spider), otherwise
+# one per case. The hearings/timeline patch is merged into extra_data by
+# PostgreSQL, so the existing JSON never makes a round trip through Python.
+_ENRICH_CASE_STMT = update(CourtCase.__table__).where(
+    CourtCase.case_number == bindparam('p_case_number'),
+    CourtCase.court_identifier == bindparam('p_court_identifier')
+).values(
+    # extra_data=None is stored as JSON 'null' by the ORM, so treat it like SQL NULL
+    extra_data=func.coalesce(
+        func.nullif(CourtCase.extra_data, literal_column("'null'::jsonb")),
+        literal_column("'{}'::jsonb")
+    ).op('||')(bindparam('p_patch', type_=JSONB)),
+    status='enriched',
+    updated_at=bindparam('p_now'),
+    **{
+        field: func.coalesce(bindparam(f'p_{field}', type_=CourtCase.__table__.c[field].type), CourtCase.__table__.c[field])
+        for field in _ENRICHMENT_FIELDS
+    }
+)
+
 
 class KanunPatrikaPipeline(FilesPipeline):
     """Pipeline for downloading Kanun Patrika PDF files with custom naming."""
@@ -6,14 +69,16 @@ class KanunPatrikaPipeline(FilesPipeline):
     def file_path(self, request, response=None, info=None, *, item=None):
         """Generate custom file path based on metadata."""
         metadata = item.get('metadata', {})
-        file_id = request.url.split("/")[-1].replace(".pdf", "")
+        file_id = request.url.rpartition("/")[2].replace(".pdf", "")
         
         if metadata:
-            year = metadata.get('year', '')
-            month = metadata.get('month', '')
-            volume = metadata.get('volume', '')
-            issue = metadata.get('issue', '')
-            return f"{year} {month} भाग {volume} अंक {issue} - {file_id}.pdf"
+            return KANUN_PATRIKA_PATH_TEMPLATE.format_map({
+                'year': metadata.get('year', ''),
+                'month': metadata.get('month', ''),
+                'volume': metadata.get('volume', ''),
+                'issue': metadata.get('issue', ''),
+                'file_id': file_id,
+            })
         
         return f"{file_id}.pdf"
 
@@ -25,4 +90,260 @@ class KanunPatrikaPipeline(FilesPipeline):
                 info.spider.logger.info(f"Downloaded: {file_path}")
             else:
                 info.spider.logger.error(f"Failed: {item['file_urls'][0]}")
-        return item
\ No newline at end of file
+        return item
+
+
+class BatchWritePipeline:
+    """
+    Base for pipelines that persist items in batches.
+    
+    Items of item_classes are buffered until batch_size is reached (counted with
+    _item_size) and once more when the spider closes. Each batch is written on a
+    worker thread, in a transaction of its own, so the reactor keeps downloading
+    while the database is busy. Batches are written one at a time and in order.
+    Subclasses implement _write_batch.
+    """
+    
+    item_classes: Tuple[type, ...] = ()
+    batch_size_setting: str = None
+    default_batch_size: int = None
+    
+    def __init__(self, batch_size: int, engine_options: Dict = None):
+        self.batch_size = batch_size
+        self.engine_options = engine_options or {}
+        self.engine = None
+        self._items: List = []
+        self._pending = 0
+        self._write_lock = DeferredLock()
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            batch_size=crawler.settings.getint(cls.batch_size_setting, cls.default_batch_size),
+            engine_options=crawler.settings.getdict('DATABASE_ENGINE_OPTIONS'),
+        )
+    
+    def open_spider(self):
+        self.engine = get_engine(**self.engine_options)
+    
+    async def process_item(self, item):
+        if not isinstance(item, self.item_classes):
+            return item
+        
+        self._items.append(item)
+        self._pending += self._item_size(item)
+        
+        if self._pending >= self.batch_size:
+            await self._flush()
+        
+        return item
+    
+    async def close_spider(self):
+        await self._flush()
+    
+    def _item_size(self, item) -> int:
+        """How much an item counts towards the batch size."""
+        return 1
+    
+    async def _flush(self):
+        """Hand the buffered items to a worker thread and write them."""
+        if not self._items:
+            return
+        
+        items, self._items = self._items, []
+        self._pending = 0
+        await maybe_deferred_to_future(self._write_lock.run(deferToThread, self._write, items))
+    
+    def _write(self, items: List):
+        """Write one batch in a single transaction and log its summary once committed."""
+        # Sessions are not thread-safe, so every batch gets its own
+        session = get_session(self.engine)
+        try:
+            with session.begin():
+                summary = self._write_batch(session, items)
+        finally:
+            session.close()
+        
+        logger.info(summary)
+    
+    def _write_batch(self, session, items: List) -> str:
+        """Write the items with session (inside its transaction); return a summary to log."""
+        raise NotImplementedError
+
+
+class EnrichmentPipeline(BatchWritePipeline):
+    """Persist case enrichment items in batches of ENRICHMENT_BATCH_SIZE cases."""
+    
+    item_classes = (EnrichedCaseItem, FailedCaseItem)
+    batch_size_setting = 'ENRICHMENT_BATCH_SIZE'
+    default_batch_size = ENRICHMENT_BATCH_SIZE
+    
+    def __init__(self, batch_size: int, use_copy: bool = True, engine_options: Dict = None):
+        super().__init__(batch_size, engine_options)
+        self.use_copy = use_copy
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = super().from_crawler(crawler)
+        pipeline.use_copy = crawler.settings.getbool('ENRICHMENT_USE_COPY', True)
+        return pipeline
+    
+    def _write_batch(self, session, items: List) -> str:
+        """Write one batch of enriched and failed cases."""
+        enriched: Dict[Tuple[str, str], EnrichedCaseItem] = {}
+        failed: Dict[Tuple[str, str], FailedCaseItem] = {}
+        for item in items:
+            key = (item['case_number'], item['court_identifier'])
+            if isinstance(item, FailedCaseItem):
+                failed[key] = item
+            elif key in enriched:
+                logger.info(f"Case {key[0]} already enriched, skipping")
+            else:
+                enriched[key] = item
+        
+        # Every row in the batch is stamped with the same updated_at/created_at
+        now = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
+        
+        case_updates: List[Dict] = []
+        entity_inserts: List[Dict] = []
+        entity_deletes: List[Tuple[str, str]] = []
+        
+        existing = {}
+        if enriched:
+            rows = session.execute(_SELECT_CASES_STMT, {'keys': list(enriched)})
+            existing = {(cn, ci): status for cn, ci, status in rows}
+        
+        for key, item in enriched.items():
+            case_number, code_name = key
+            if key not in existing:
+                logger.warning(f"Case {case_number} not found in database")
+                continue
+            
+            # Check if already enriched (by parallel worker)
+            if existing[key] == 'enriched':
+                logger.info(f"Case {case_number} already enriched, skipping")
+                continue
+            
+            enrichment_data = item['enrichment_data']
+            case_updates.append({
+                'p_case_number': case_number,
+                'p_court_identifier': code_name,
+                # Store hearings and timeline in extra_data, keeping existing keys
+                'p_patch': {
+                    'enrichment_hearings': item['hearings_timeline'].get('hearings', []),
+                    'enrichment_timeline': item['hearings_timeline'].get('timeline', []),
+                },
+                'p_now': now,
+                **{f'p_{field}': enrichment_data.get(field) for field in _ENRICHMENT_FIELDS},
+            })
+            
+            # Delete existing entities for this case (in case of re-enrichment)
+            # NOTE: THIS IS A BIG RISK, AS WE MAY HAVE DOWNSTREAM LINKAGES OF ENRICHED CASE ENTITIES
+            # TODO: Revisit this logic.
+            entity_deletes.append(key)
+            
+            entities = item['entities']
+            for side, parties in (('plaintiff', entities['plaintiffs']), ('defendant', entities['defendants'])):
+                for party in parties:
+                    entity_inserts.append({
+                        'case_number': case_number,
+                        'court_identifier': code_name,
+                        'side': side,
+                        'name': party['name'],
+                        'address': party.get('address'),
+                        'created_at': now,
+                        'updated_at': now,
+                    })
+        
+        if case_updates:
+            session.execute(_ENRICH_CASE_STMT, case_updates)
+            # One DELETE for the whole batch
+            session.execute(
+                delete(CaseEntity).where(
+                    tuple_(CaseEntity.case_number, CaseEntity.court_identifier).in_(entity_deletes)
+                )
+            )
+        if entity_inserts:
+            if self.use_copy and self.engine.dialect.name == 'postgresql':
+                self._copy_entities(session, entity_inserts)
+            else:
+                session.bulk_insert_mappings(CaseEntity, entity_inserts)
+        
+        # Mark failed cases (never overwrite a case enriched in this batch)
+        failed_keys = [key for key in failed if key not in enriched]
+        if failed_keys:
+            session.execute(
+                update(CourtCase).where(
+                    tuple_(CourtCase.case_number, CourtCase.court_identifier).in_(failed_keys)
+                ).values(status='failed', updated_at=now).execution_options(synchronize_session=False)
+            )
+        
+        return (
+            f"Saved {len(case_updates)} enriched cases ({len(entity_inserts)} entities), "
+            f"{len(failed_keys)} failed cases"
+        )
+    
+    def _copy_entities(self, session, entity_inserts: List[Dict]):
+        """Load entity rows with PostgreSQL COPY, inside the session's current transaction."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in entity_inserts:
+            # Unquoted empty fields are read back as NULL (e.g. missing addresses)
+            writer.writerow([row[column] for column in _ENTITY_COPY_COLUMNS])
+        buffer.seek(0)
+        
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {CaseEntity.__tablename__} ({', '.join(_ENTITY_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+
+class CauseListPipeline(BatchWritePipeline):
+    """
+    Persist high court cause lists in batches of CAUSE_LIST_BATCH_SIZE hearings.
+    
+    Batches are written in order, so a date is never marked scraped before the
+    benches parsed ahead of it are stored.
+    """
+    
+    item_classes = (CauseListItem,)
+    batch_size_setting = 'CAUSE_LIST_BATCH_SIZE'
+    default_batch_size = CAUSE_LIST_BATCH_SIZE
+    
+    def _item_size(self, item) -> int:
+        return len(item['hearings'])
+    
+    def _write_batch(self, session, items: List[CauseListItem]) -> str:
+        """Write one batch of bench items."""
+        cases = [case for item in items for case in item['cases']]
+        hearings = [hearing for item in items for hearing in item['hearings']]
+        
+        # Replace hearings an earlier run left for these benches if it stopped before marking their dates
+        benches = [
+            (item['court_identifier'], item['date_bs'], item['bench_id'])
+            for item in items if item['bench_id'] is not None
+        ]
+        if benches:
+            session.execute(
+                delete(CourtCaseHearing).where(
+                    tuple_(
+                        CourtCaseHearing.court_identifier,
+                        CourtCaseHearing.hearing_date_bs,
+                        CourtCaseHearing.extra_data['bench_id'].astext,
+                    ).in_(benches)
+                )
+            )
+        
+        save_cases_and_hearings(session, cases, hearings)
+        
+        for item in items:
+            if item['bench_count'] is not None:
+                mark_date_scraped(
+                    session, item['court_identifier'], item['date_bs'], f"{item['bench_count']} benches"
+                )
+        
+        return f"Saved {len(hearings)} hearings from {len(items)} cause lists"
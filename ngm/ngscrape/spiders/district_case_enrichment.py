@@ -9,35 +9,85 @@ POST params: mudda_no (case number in Devanagari), submit
 """
 
 import scrapy
-from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import islice
+from types import MappingProxyType
+from typing import Callable, List, Dict, Optional, Tuple
 from scrapy.crawler import CrawlerProcess
 from scrapy.http import FormRequest
-from bs4 import BeautifulSoup
-import pytz
-from sqlalchemy import and_
-from sqlalchemy.orm.attributes import flag_modified
-from ngm.utils.normalizer import normalize_whitespace, normalize_date, roman_to_nepali_numerals
+from lxml import etree, html as lxml_html
+from sqlalchemy import and_, or_, select, tuple_
+from ngm.utils.normalizer import normalize_whitespace, normalize_date, ROMAN_TO_NEPALI_DIGITS
 from ngm.utils.court_ids import DISTRICT_COURTS
-from ngm.database.models import (
-    get_engine, get_session, init_db, 
-    CourtCase, CaseEntity
-)
+from ngm.utils.html_text import element_text_stripped
+from ngm.database.models import get_engine, get_session, init_db, CourtCase
 from ngm.utils.db_helpers import convert_bs_to_ad
+from ngm.ngscrape.items import EnrichedCaseItem, FailedCaseItem
+from ngm.ngscrape.constants import ENRICHMENT_BATCH_SIZE, ENRICHMENT_QUERY_CHUNK_SIZE
+
+# Read-only lookup of court identifier -> district court info
+COURT_LOOKUP = MappingProxyType({court['code_name']: court for court in DISTRICT_COURTS})
+
+# Section headings that are only present when the case was found; the pages are
+# served as UTF-8, so they are matched against the raw body without decoding it
+_SECTION_PARTY = "वादी/प्रतिवादीको विवरण"
+_SECTION_HEARING = "पेशी विवरण"
+_SENTINEL_PARTY = _SECTION_PARTY.encode('utf-8')
+_SENTINEL_HEARING = _SECTION_HEARING.encode('utf-8')
+
+# Matches elements whose class list contains "record_display"
+RECORD_DISPLAY_TABLE = "table[contains(concat(' ', normalize-space(@class), ' '), ' record_display ')]"
+
+# Section tables sit in the row after the one holding the section's h4
+NEXT_ROW_TABLES_XPATH = etree.XPath(f"./ancestor::tr[1]/following-sibling::tr[1]//{RECORD_DISPLAY_TABLE}")
+NEXT_ROW_TABLE_XPATH = etree.XPath(f"(./ancestor::tr[1]/following-sibling::tr[1]//{RECORD_DISPLAY_TABLE})[1]")
+
+# dl blocks holding the case details (dt label / dd value pairs)
+CONTENT_DL_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]//dl")
+DT_XPATH = etree.XPath('.//dt')
+DD_XPATH = etree.XPath('.//dd')
+
+# h2 headings that may carry the registration number (fallback when the dl has none)
+REGISTRATION_H2_XPATH = etree.XPath('//h2[contains(., "रजिष्ट्रेशन नं")]')
+
+# h4 heading of the party (plaintiff/defendant) section
+PARTY_H4_XPATH = etree.XPath('(//h4[contains(., "वादी/प्रतिवादीको विवरण")])[1]')
+
+# Side heading (वादी / प्रतिवादी) of a party table
+PARTY_HEADER_TH_XPATH = etree.XPath('.//th[@colspan="2"][1]')
+
+# h4 headings of the hearing (पेशी विवरण) and timeline (तारेख ... विवरण) sections
+HEARING_TIMELINE_H4_XPATH = etree.XPath(
+    '//h4[contains(., "पेशी विवरण") or (contains(., "तारेख") and contains(., "विवरण"))]'
+)
+
 
-KATHMANDU_TZ = pytz.timezone('Asia/Kathmandu')
+def _has_case_sections(response) -> bool:
+    """Whether the detail page has the party or hearing section (i.e. the case was found)."""
+    if response.encoding != 'utf-8':
+        return _SECTION_PARTY in response.text or _SECTION_HEARING in response.text
+    return _SENTINEL_PARTY in response.body or _SENTINEL_HEARING in response.body
+
+
+def _parse_html(response):
+    """Build an lxml tree straight from the response bytes."""
+    parser = lxml_html.HTMLParser(encoding=response.encoding)
+    return lxml_html.fromstring(response.body, parser=parser)
+
+
+def _row_cells(table, skip_rows: int):
+    """Yield the td cells of each row of a table, after skipping its header rows."""
+    for row in islice(table.iter('tr'), skip_rows, None):
+        yield row.findall('td')
 
 
 def parse_party_table(table) -> List[Dict[str, str]]:
     """Parse a party (plaintiff/defendant) table."""
     parties = []
-    rows = table.find_all('tr')[2:]  # Skip header rows
     
-    for row in rows:
-        cells = row.find_all('td')
+    for cells in _row_cells(table, 2):  # Skip header rows
         if len(cells) >= 2:
-            name = cells[0].get_text(strip=True)
-            address = cells[1].get_text(strip=True)
+            name = element_text_stripped(cells[0])
+            address = element_text_stripped(cells[1])
             
             # Only add if name is not empty
             if name:
@@ -51,37 +101,48 @@ def parse_party_table(table) -> List[Dict[str, str]]:
 
 def parse_hearing_table(table) -> List[Dict[str, str]]:
     """Parse hearing schedule table."""
-    hearings = []
-    rows = table.find_all('tr')[1:]  # Skip header row
-    
-    for row in rows:
-        cells = row.find_all('td')
-        if len(cells) >= 5:
-            hearings.append({
-                'date': cells[0].get_text(strip=True),
-                'type': cells[1].get_text(strip=True),
-                'division': cells[2].get_text(strip=True),
-                'judge': cells[3].get_text(strip=True),
-                'order': cells[4].get_text(strip=True)
-            })
-    
-    return hearings
+    return [
+        {
+            'date': element_text_stripped(cells[0]),
+            'type': element_text_stripped(cells[1]),
+            'division': element_text_stripped(cells[2]),
+            'judge': element_text_stripped(cells[3]),
+            'order': element_text_stripped(cells[4])
+        }
+        for cells in _row_cells(table, 1)  # Skip header row
+        if len(cells) >= 5
+    ]
 
 
 def parse_timeline_table(table) -> List[Dict[str, str]]:
     """Parse case timeline table."""
-    timeline = []
-    rows = table.find_all('tr')[1:]  # Skip header row
-    
-    for row in rows:
-        cells = row.find_all('td')
-        if len(cells) >= 2:
-            timeline.append({
-                'date': cells[0].get_text(strip=True),
-                'type': cells[1].get_text(strip=True)
-            })
-    
-    return timeline
+    return [
+        {
+            'date': element_text_stripped(cells[0]),
+            'type': element_text_stripped(cells[1])
+        }
+        for cells in _row_cells(table, 1)  # Skip header row
+        if len(cells) >= 2
+    ]
+
+
+def _verdict_date_fields(value: str) -> List[Tuple[str, object]]:
+    verdict_date_bs = normalize_date(value)
+    fields = [('verdict_date_bs', verdict_date_bs)]
+    if value != '**** ** **':
+        fields.append(('verdict_date_ad', convert_bs_to_ad(verdict_date_bs)))
+    return fields
+
+
+# Detail page dt labels -> handler returning (field, value) pairs for the dd value
+LABEL_HANDLERS: Dict[str, Callable[[str], List[Tuple[str, object]]]] = {
+    'रजिष्ट्रेशन नं': lambda value: [('registration_number', value[:100])],
+    'मुद्दाको बिषय': lambda value: [('case_subject', value)],
+    'मुद्दाको स्थिति': lambda value: [('case_status', value[:100])],
+    'फैसला मिति': _verdict_date_fields,
+    'फैसला गर्ने मा. न्यायाधीश': lambda value: [('verdict_judge', value[:200])],
+    'पेशी चढेको संख्या': lambda value: [('hearing_count', value[:20])],
+}
 
 
 class DistrictCaseEnrichmentSpider(scrapy.Spider):
@@ -95,52 +156,60 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
         # "RETRY_PRIORITY_ADJUST": -1,
         "CONCURRENT_REQUESTS": 6,  # Be gentle with enrichment requests
         # "DOWNLOAD_DELAY": 2,  # 2 second delay between requests
+        "ITEM_PIPELINES": {
+            "ngm.ngscrape.pipelines.EnrichmentPipeline": 300,
+        },
+        # Detail page cache for local re-runs after a failure; off unless the crawl
+        # is started with -s HTTPCACHE_ENABLED=1 (CI runners start without a cache)
+        "HTTPCACHE_EXPIRATION_SECS": 7 * 24 * 60 * 60,
+        "HTTPCACHE_DIR": "httpcache/district_enrichment",
+        "HTTPCACHE_STORAGE": "scrapy.extensions.httpcache.FilesystemCacheStorage",
+        "HTTPCACHE_POLICY": "scrapy.extensions.httpcache.DummyPolicy",
+        "HTTPCACHE_IGNORE_HTTP_CODES": [500, 502, 503, 504, 408, 429],  # Let these be retried
+        "HTTPCACHE_GZIP": True,
+        # Connection pool sized for the concurrent requests plus the pipeline's writer threads
+        "DATABASE_ENGINE_OPTIONS": {
+            "pool_size": 8,
+            "max_overflow": 4,
+            "pool_pre_ping": False,
+            "pool_recycle": 3600,
+            "isolation_level": "READ COMMITTED",
+            # psycopg2 runs executemany() one statement per row; send the pipeline's
+            # per-case enrichment UPDATEs with execute_batch(), a whole batch per round trip
+            "executemany_mode": "values_plus_batch",
+            "executemany_batch_page_size": ENRICHMENT_BATCH_SIZE,
+        },
     }
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, shard=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        
+        # Optional "i/M" spider arg: only enrich the courts at index i modulo M, so that
+        # M processes can split the work, e.g. `scrapy crawl district_case_enrichment -a shard=0/4`
+        self.court_identifiers = None
+        if shard:
+            try:
+                index, count = (int(part) for part in shard.split('/'))
+            except ValueError:
+                raise ValueError(f"Invalid shard {shard!r}, expected 'i/M' (e.g. '0/4')")
+            if not 0 <= index < count:
+                raise ValueError(f"Invalid shard {shard!r}, expected 0 <= i < M")
+            
+            self.court_identifiers = [
+                court['code_name'] for idx, court in enumerate(DISTRICT_COURTS) if idx % count == index
+            ]
+            self.logger.info(f"Shard {shard}: enriching {len(self.court_identifiers)} district courts")
 
     def start_requests(self):
         """Generate requests for cases that need enrichment"""
-        self.engine = get_engine()
+        self.engine = get_engine(**self.settings.getdict('DATABASE_ENGINE_OPTIONS'))
         init_db(self.engine)
         self.session = get_session(self.engine)
         
-        # Query all district court cases that need enrichment in one go
-        # Priority: newer registration dates first, status = pending or NULL
-        with self.session.begin():
-            cases_to_enrich = self.session.query(
-                CourtCase.case_number,
-                CourtCase.court_identifier
-            ).filter(
-                and_(
-                    CourtCase.court_identifier.like('%dc'),
-                    CourtCase.status.in_(['pending', None])
-                )
-            ).order_by(
-                CourtCase.registration_date_ad.desc().nullslast()
-            ).all()
-        
-        if not cases_to_enrich:
-            self.logger.info("No district court cases to enrich")
-            return
-        
-        # Log summary statistics
-        cases_by_court = {}
-        for case_number, court_identifier in cases_to_enrich:
-            cases_by_court[court_identifier] = cases_by_court.get(court_identifier, 0) + 1
-        
-        self.logger.info(
-            f"Found {len(cases_to_enrich)} total district court cases to enrich "
-            f"across {len(cases_by_court)} courts"
-        )
-        
-        # Create a lookup map for court identifiers to district info
-        court_lookup = {court['code_name']: court for court in DISTRICT_COURTS}
-        
+        total = 0
         # Generate requests for each case
-        for case_number, court_identifier in cases_to_enrich:
-            court_info = court_lookup.get(court_identifier)
+        for case_number, court_identifier in self._cases_to_enrich():
+            court_info = COURT_LOOKUP.get(court_identifier)
             if not court_info:
                 self.logger.warning(f"Court {court_identifier} not found in DISTRICT_COURTS lookup")
                 continue
@@ -148,11 +217,15 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
             district_id = court_info['district_id']
             district_name = court_info['district']
             
-            # Convert case number to Devanagari
-            case_number_devanagari = roman_to_nepali_numerals(case_number)
+            # Convert case number to Devanagari (only digits differ)
+            case_number_devanagari = case_number.translate(ROMAN_TO_NEPALI_DIGITS)
             
             url = self.base_url.format(district_id=district_id)
             
+            total += 1
+            if total % ENRICHMENT_QUERY_CHUNK_SIZE == 0:
+                self.logger.info(f"Queued {total} district court cases for enrichment so far")
+            
             yield FormRequest(
                 url=url,
                 method='POST',
@@ -171,6 +244,62 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
                 dont_filter=True,
                 errback=self.handle_error
                 )
+        
+        if not total:
+            self.logger.info("No district court cases to enrich")
+            return
+        
+        self.logger.info(f"Queued {total} total district court cases for enrichment")
+
+    def _cases_to_enrich(self):
+        """
+        Yield (case_number, court_identifier) of the district court cases that need enrichment.
+        
+        Cases are read a page at a time with keyset pagination, each page in its own
+        short transaction, so no snapshot stays open while requests are being scheduled.
+        Priority: newer registration dates first, status = pending or NULL
+        """
+        registration_date = CourtCase.registration_date_ad
+        # The key columns break ties so the order is total and each page resumes exactly after the last
+        case_key = tuple_(CourtCase.court_identifier, CourtCase.case_number)
+        cases_to_enrich = select(
+            CourtCase.case_number,
+            CourtCase.court_identifier,
+            registration_date
+        ).where(
+            and_(
+                CourtCase.court_identifier.in_(self.court_identifiers)
+                if self.court_identifiers is not None
+                else CourtCase.court_identifier.like('%dc'),
+                CourtCase.status.in_(['pending', None])
+            )
+        ).order_by(
+            registration_date.desc().nullslast(),
+            CourtCase.court_identifier.desc(),
+            CourtCase.case_number.desc()
+        ).limit(ENRICHMENT_QUERY_CHUNK_SIZE)
+        
+        page_query = cases_to_enrich
+        while True:
+            with self.session.begin():
+                page = self.session.execute(page_query).all()
+            
+            for case_number, court_identifier, _ in page:
+                yield case_number, court_identifier
+            
+            if len(page) < ENRICHMENT_QUERY_CHUNK_SIZE:
+                return
+            
+            case_number, court_identifier, last_date = page[-1]
+            after_last = case_key < tuple_(court_identifier, case_number)
+            if last_date is None:
+                page_query = cases_to_enrich.where(registration_date.is_(None), after_last)
+            else:
+                page_query = cases_to_enrich.where(or_(
+                    registration_date < last_date,
+                    registration_date.is_(None),
+                    and_(registration_date == last_date, after_last)
+                ))
 
     def handle_error(self, failure):
         """Handle request errors"""
@@ -183,111 +312,68 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
         )
         
         # Mark case as failed
-        with self.session.begin():
-            case = self.session.query(CourtCase).filter(
-                and_(
-                    CourtCase.case_number == case_number,
-                    CourtCase.court_identifier == code_name
-                )
-            ).first()
-            
-            if case:
-                case.status = 'failed'
-                case.updated_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
+        yield FailedCaseItem(case_number=case_number, court_identifier=code_name)
 
     def parse_case_detail(self, response):
         """Parse the case detail page and update database"""
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         code_name = response.meta['code_name']
         case_number = response.meta['case_number']
         
-        # Check if case was found
-        if "वादी/प्रतिवादीको विवरण" not in response.text and "पेशी विवरण" not in response.text:
+        # Check if case was found before building the tree
+        if not _has_case_sections(response):
             self.logger.warning(f"Case {case_number} not found in detail page")
             
             # Mark as failed
-            with self.session.begin():
-                case = self.session.query(CourtCase).filter(
-                    and_(
-                        CourtCase.case_number == case_number,
-                        CourtCase.court_identifier == code_name
-                    )
-                ).first()
-                
-                if case:
-                    case.status = 'failed'
-                    case.updated_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
-            
+            yield FailedCaseItem(case_number=case_number, court_identifier=code_name)
             return
         
-        # Check if already enriched (by parallel worker)
-        with self.session.begin():
-            case = self.session.query(CourtCase).filter(
-                and_(
-                    CourtCase.case_number == case_number,
-                    CourtCase.court_identifier == code_name
-                )
-            ).first()
-            
-            if not case:
-                self.logger.warning(f"Case {case_number} not found in database")
-                return
-            
-            if case.status == 'enriched':
-                self.logger.info(f"Case {case_number} already enriched, skipping")
-                return
+        tree = _parse_html(response)
         
         # Extract enrichment data
-        enrichment_data = self._extract_enrichment_data(soup)
-        entities = self._extract_entities(soup)
-        hearings_timeline = self._extract_hearings_timeline(soup)
-        
-        # Update database
-        self._save_enrichment(case_number, code_name, enrichment_data, entities, hearings_timeline)
+        enrichment_data = self._extract_enrichment_data(tree)
+        entities = self._extract_entities(tree)
+        hearings_timeline = self._extract_hearings_timeline(tree)
         
         self.logger.info(
-            f"Enriched case {case_number} ({code_name}): "
+            f"Parsed case {case_number} ({code_name}): "
             f"{len(entities['plaintiffs'])} plaintiffs, {len(entities['defendants'])} defendants"
         )
+        
+        # Persisted in batches by EnrichmentPipeline
+        yield EnrichedCaseItem(
+            case_number=case_number,
+            court_identifier=code_name,
+            enrichment_data=enrichment_data,
+            entities=entities,
+            hearings_timeline=hearings_timeline,
+        )
 
-    def _extract_enrichment_data(self, soup: BeautifulSoup) -> Dict:
+    def _extract_enrichment_data(self, tree) -> Dict:
         """Extract enrichment data from case detail page"""
         data = {}
         
         # Extract basic information from dl/dt/dd tags
-        content_divs = soup.find_all('div', class_='content')
-        for content_div in content_divs:
-            dls = content_div.find_all('dl')
-            for dl in dls:
-                dts = dl.find_all('dt')
-                dds = dl.find_all('dd')
+        for dl in CONTENT_DL_XPATH(tree):
+            dts = DT_XPATH(dl)
+            dds = DD_XPATH(dl)
+            
+            for dt, dd in zip(dts, dds):
+                # Map Nepali labels to database fields
+                handler = LABEL_HANDLERS.get(element_text_stripped(dt).rstrip(':').strip())
+                if handler is None:
+                    continue
                 
-                for dt, dd in zip(dts, dds):
-                    label = dt.get_text(strip=True).rstrip(':').strip()
-                    value = dd.get_text(strip=True)
-                    
-                    # Map Nepali labels to database fields
-                    if label == 'रजिष्ट्रेशन नं' and value:
-                        data['registration_number'] = value[:100]
-                    elif label == 'मुद्दाको बिषय' and value:
-                        data['case_subject'] = value
-                    elif label == 'मुद्दाको स्थिति' and value:
-                        data['case_status'] = value[:100]
-                    elif label == 'फैसला मिति' and value:
-                        data['verdict_date_bs'] = normalize_date(value)
-                        if value and value != '**** ** **':
-                            data['verdict_date_ad'] = convert_bs_to_ad(normalize_date(value))
-                    elif label == 'फैसला गर्ने मा. न्यायाधीश' and value:
-                        data['verdict_judge'] = value[:200]
-                    elif label == 'पेशी चढेको संख्या' and value:
-                        data['hearing_count'] = value[:20]
+                value = element_text_stripped(dd)
+                if not value:
+                    continue
+                
+                for key, field_value in handler(value):
+                    data[key] = field_value
         
         # Extract registration number from h2 tags if not found
         if 'registration_number' not in data:
-            h2_tags = soup.find_all('h2')
-            for h2 in h2_tags:
-                text = h2.get_text(strip=True)
+            for h2 in REGISTRATION_H2_XPATH(tree):
+                text = element_text_stripped(h2)
                 if 'रजिष्ट्रेशन नं' in text:
                     reg_num = text.split(':')[-1].strip()
                     if reg_num:
@@ -295,41 +381,27 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
         
         return data
 
-    def _extract_entities(self, soup: BeautifulSoup) -> Dict[str, List[Dict]]:
+    def _extract_entities(self, tree) -> Dict[str, List[Dict]]:
         """Extract plaintiff and defendant information"""
         entities = {
             'plaintiffs': [],
             'defendants': []
         }
         
-        # Find the section with party details
-        h4_party = None
-        for h4 in soup.find_all('h4'):
-            if 'वादी/प्रतिवादीको विवरण' in h4.get_text():
-                h4_party = h4
-                break
-        
+        # Find the section with party details, then the tables in the row after its parent row
+        # (plaintiff and defendant side by side)
+        h4_party = PARTY_H4_XPATH(tree)
         if not h4_party:
             return entities
         
-        # Find the parent row and get the next row with tables
-        parent_tr = h4_party.find_parent('tr')
-        if not parent_tr:
-            return entities
-        
-        next_tr = parent_tr.find_next_sibling('tr')
-        if not next_tr:
-            return entities
-        
-        # Get both tables (plaintiff and defendant side by side)
-        tables = next_tr.find_all('table', class_='record_display')
+        tables = NEXT_ROW_TABLES_XPATH(h4_party[0])
         
         for table in tables:
-            header = table.find('th', colspan='2')
+            header = PARTY_HEADER_TH_XPATH(table)
             if not header:
                 continue
             
-            header_text = header.get_text(strip=True)
+            header_text = element_text_stripped(header[0])
             parties = parse_party_table(table)
             
             if 'वादी' in header_text and 'प्रतिवादी' not in header_text:
@@ -339,116 +411,27 @@ class DistrictCaseEnrichmentSpider(scrapy.Spider):
         
         return entities
 
-    def _extract_hearings_timeline(self, soup: BeautifulSoup) -> Dict[str, List[Dict]]:
+    def _extract_hearings_timeline(self, tree) -> Dict[str, List[Dict]]:
         """Extract hearing and timeline information"""
         data = {
             'hearings': [],
             'timeline': []
         }
         
-        # Find hearing and timeline sections
-        h4_tags = soup.find_all('h4')
-        for h4 in h4_tags:
-            h4_text = h4.get_text(strip=True)
+        # Find hearing and timeline sections in a single pass over the document
+        for h4 in HEARING_TIMELINE_H4_XPATH(tree):
+            h4_text = element_text_stripped(h4)
             
             if 'पेशी विवरण' in h4_text:
                 # Find the table after this h4
-                parent = h4.find_parent('tr')
-                if parent:
-                    next_row = parent.find_next_sibling('tr')
-                    if next_row:
-                        table = next_row.find('table', class_='record_display')
-                        if table:
-                            data['hearings'] = parse_hearing_table(table)
+                table = NEXT_ROW_TABLE_XPATH(h4)
+                if table:
+                    data['hearings'] = parse_hearing_table(table[0])
             
             elif 'तारेख' in h4_text and 'विवरण' in h4_text:
                 # Find the table after this h4
-                parent = h4.find_parent('tr')
-                if parent:
-                    next_row = parent.find_next_sibling('tr')
-                    if next_row:
-                        table = next_row.find('table', class_='record_display')
-                        if table:
-                            data['timeline'] = parse_timeline_table(table)
+                table = NEXT_ROW_TABLE_XPATH(h4)
+                if table:
+                    data['timeline'] = parse_timeline_table(table[0])
         
         return data
-
-    def _save_enrichment(
-        self, 
-        case_number: str, 
-        code_name: str, 
-        enrichment_data: Dict,
-        entities: Dict[str, List[Dict]],
-        hearings_timeline: Dict[str, List[Dict]]
-    ):
-        """Save enrichment data and entities to database"""
-        now = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
-        
-        with self.session.begin():
-            # Update case with enrichment data
-            case = self.session.query(CourtCase).filter(
-                and_(
-                    CourtCase.case_number == case_number,
-                    CourtCase.court_identifier == code_name
-                )
-            ).first()
-            
-            if not case:
-                self.logger.error(f"Case {case_number} not found for enrichment")
-                return
-            
-            # Update fields
-            for key, value in enrichment_data.items():
-                setattr(case, key, value)
-            
-            # Store hearings and timeline in extra_data
-            if case.extra_data is None:
-                case.extra_data = {}
-            
-            case.extra_data['enrichment_hearings'] = hearings_timeline.get('hearings', [])
-            case.extra_data['enrichment_timeline'] = hearings_timeline.get('timeline', [])
-            
-            # Mark extra_data as modified so SQLAlchemy persists the changes
-            flag_modified(case, 'extra_data')
-            
-            case.status = 'enriched'
-            case.enriched_at = now
-            case.updated_at = now
-            
-            # Delete existing entities for this case (in case of re-enrichment)
-            # NOTE: THIS IS A BIG RISK, AS WE MAY HAVE DOWNSTREAM LINKAGES OF ENRICHED CASE ENTITIES
-            # TODO: Revisit this logic.
-            self.session.query(CaseEntity).filter(
-                and_(
-                    CaseEntity.case_number == case_number,
-                    CaseEntity.court_identifier == code_name
-                )
-            ).delete()
-            
-            # Add plaintiff entities
-            for plaintiff in entities['plaintiffs']:
-                entity = CaseEntity(
-                    case_number=case_number,
-                    court_identifier=code_name,
-                    side='plaintiff',
-                    name=plaintiff['name'],
-                    address=plaintiff.get('address'),
-                    created_at=now,
-                    updated_at=now
-                )
-                self.session.add(entity)
-            
-            # Add defendant entities
-            for defendant in entities['defendants']:
-                entity = CaseEntity(
-                    case_number=case_number,
-                    court_identifier=code_name,
-                    side='defendant',
-                    name=defendant['name'],
-                    address=defendant.get('address'),
-                    created_at=now,
-                    updated_at=now
-                )
-                self.session.add(entity)
-
-
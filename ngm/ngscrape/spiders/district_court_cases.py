@@ -100,6 +100,7 @@ class DistrictCourtCasesSpider(scrapy.Spider):
         data: List[Tuple[CourtCase, CourtCaseHearing]] = []
         current_bench = None
         current_judge = None
+        scraped_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
         
         for table in case_tables:
             prev_table = table.find_previous_sibling('table')
@@ -176,7 +177,7 @@ class DistrictCourtCasesSpider(scrapy.Spider):
                         serial_no=serial_no,
                         decision_type=decision_type,
                         remarks=remarks,
-                        scraped_at=datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
+                        scraped_at=scraped_at
                     )
                     
                     data.append((case, hearing))
@@ -8,9 +8,12 @@ URL pattern: https://supremecourt.gov.np/court/{court_id}/bench_list?pesi_date={
 import scrapy
 import re
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from io import BytesIO
+from itertools import zip_longest
+from typing import Dict, List, Optional, Tuple
 from scrapy.http import FormRequest
 from bs4 import BeautifulSoup
+from lxml import etree
 from nepali.datetime import nepalidate
 import pytz
 from ngm.utils.normalizer import (
@@ -20,12 +23,106 @@ from ngm.utils.normalizer import (
     fix_parenthesis_spacing,
 )
 from ngm.utils.court_ids import HIGH_COURTS
-from ngm.database.models import get_engine, get_session, init_db, CourtCase, CourtCaseHearing
-from ngm.utils.db_helpers import get_scraped_dates, mark_date_scraped, convert_bs_to_ad, CaseCache
+from ngm.database.models import get_engine, get_session, init_db
+from ngm.utils.html_text import element_text, element_text_with_breaks
+from ngm.utils.db_helpers import get_scraped_dates, convert_bs_to_ad
+from ngm.ngscrape.items import CauseListItem
 from ngm.ngscrape.constants import SCRAPE_LOOKBACK_DAYS, SCRAPE_OFFSET_DAYS
 
 KATHMANDU_TZ = pytz.timezone('Asia/Kathmandu')
 
+# Bench row onclick handler: send_data('<bench_id>', '<bench_no>', '<hearing_date>')
+SEND_DATA_RE = re.compile(r"send_data\('(\d+)',\s*'([^']+)',\s*'(\d+)'\)")
+
+# Parenthesised notes after a case number, e.g. "081-WO-0001 (पुनरावेदन)"
+PARENTHESIZED_RE = re.compile(r'\s*\([^)]*\)\s*')
+
+# Heading that names the bench type (e.g. "संयुक्त इजलास")
+BENCH_TYPE_H4_XPATH = etree.XPath('(//h4[contains(., "इजलास")])[1]')
+
+# Cause list table, and the case rows of its (first) tbody
+CASE_TABLE_CLASS = 'table table-bordered table-hover'
+CASE_TABLE_XPATH = etree.XPath(f"(//table[@class='{CASE_TABLE_CLASS}'])[1]")
+CASE_ROWS_XPATH = etree.XPath(
+    "(.//tbody)[1]//tr[contains(concat(' ', normalize-space(@class), ' '), ' data_row ')]"
+)
+
+# Cause lists with more case rows than this are streamed with iterparse, dropping
+# each row once read, instead of being parsed into a full tree
+LARGE_CAUSE_LIST_ROWS = 200
+
+
+def _row_cell_texts(row) -> Optional[List[str]]:
+    """Raw text of a case row's nine cells, or None if the row is shorter."""
+    cells = list(row.iter('td'))
+    if len(cells) < 9:
+        return None
+    return [
+        element_text(cells[0]),
+        element_text(cells[1]),
+        element_text(cells[2]),
+        element_text(cells[3]),
+        element_text_with_breaks(cells[4], ' '),  # Case number, notes on separate lines
+        element_text(cells[5]),
+        element_text(cells[6]),
+        element_text(cells[7]),
+        element_text_with_breaks(cells[8], '\n'),  # Multi-line status
+    ]
+
+
+def _parse_cause_list(root) -> Tuple[Optional[str], bool, List[Optional[List[str]]]]:
+    """Bench type heading, whether the case table exists, and its rows' cell texts."""
+    bench_type_elems = BENCH_TYPE_H4_XPATH(root)
+    bench_type = element_text(bench_type_elems[0]) if bench_type_elems else None
+    
+    case_tables = CASE_TABLE_XPATH(root)
+    if not case_tables:
+        return bench_type, False, []
+    return bench_type, True, [_row_cell_texts(row) for row in CASE_ROWS_XPATH(case_tables[0])]
+
+
+def _stream_cause_list(body: bytes, encoding: str) -> Tuple[Optional[str], bool, List[Optional[List[str]]]]:
+    """Same as _parse_cause_list, reading the page incrementally with iterparse."""
+    bench_type = None
+    case_table = tbody = None
+    rows = []
+    open_rows = []  # Indexes in rows of the case rows being parsed (case rows can nest)
+    
+    def is_case_row(element):
+        return (
+            tbody is not None
+            and 'data_row' in (element.get('class') or '').split()
+            and tbody in element.iterancestors()
+        )
+    
+    events = etree.iterparse(
+        BytesIO(body), events=('start', 'end'), tag=('h4', 'table', 'tbody', 'tr'), html=True, encoding=encoding
+    )
+    for event, element in events:
+        if event == 'start':
+            if element.tag == 'table':
+                if case_table is None and element.get('class') == CASE_TABLE_CLASS:
+                    case_table = element
+            elif element.tag == 'tbody':
+                if case_table is not None and tbody is None and case_table in element.iterancestors():
+                    tbody = element
+            elif element.tag == 'tr' and is_case_row(element):
+                # Reserve the row's slot so rows stay in document order
+                open_rows.append(len(rows))
+                rows.append(None)
+        elif element.tag == 'h4':
+            if bench_type is None and 'इजलास' in element_text(element):
+                bench_type = element_text(element)
+        elif element.tag == 'tr' and is_case_row(element):
+            rows[open_rows.pop()] = _row_cell_texts(element)
+            # Free rows of the table body once read (nested rows are freed with their parent)
+            if element.getparent() is tbody:
+                element.clear()
+                while element.getprevious() is not None:
+                    del tbody[0]
+    
+    return bench_type, case_table is not None, rows
+
 
 class HighCourtCasesSpider(scrapy.Spider):
     name = "high_court_cases"
@@ -36,14 +133,21 @@ class HighCourtCasesSpider(scrapy.Spider):
         "RETRY_TIMES": 3,
         "RETRY_HTTP_CODES": [500, 502, 503, 504, 408, 429],
         "RETRY_PRIORITY_ADJUST": -1,
+        "ITEM_PIPELINES": {
+            "ngm.ngscrape.pipelines.CauseListPipeline": 300,
+        },
+        # The spider reads and the pipeline writes one batch at a time; keep a small pool of checked connections
+        "DATABASE_ENGINE_OPTIONS": {
+            "pool_size": 4,
+            "max_overflow": 0,
+            "pool_pre_ping": True,
+        },
     }
     
     def __init__(self, court=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.engine = get_engine()
-        init_db(self.engine)
-        self.session = get_session(self.engine)
-        self.case_cache = CaseCache()
+        # First-seen column values of every case, keyed by (case_number, court_identifier)
+        self.case_rows: Dict[Tuple[str, str], Dict] = {}
         
         court_identifiers = [c['identifier'] for c in HIGH_COURTS]
         if court and court in court_identifiers:
@@ -52,64 +156,80 @@ class HighCourtCasesSpider(scrapy.Spider):
             self.courts = court_identifiers
         
         self._bench_counter = {}
-        self._data_by_date = {}
 
-    def start_requests(self):
+    async def start(self):
+        self.engine = get_engine(**self.settings.getdict('DATABASE_ENGINE_OPTIONS'))
+        init_db(self.engine)
+        # Only used for reads with explicit transactions, nothing to autoflush or reload
+        self.session = get_session(self.engine, autoflush=False, expire_on_commit=False)
+        
         now_ktm = datetime.now(KATHMANDU_TZ)
         end_date = now_ktm.date() - timedelta(days=SCRAPE_OFFSET_DAYS)
         start_date = end_date - timedelta(days=SCRAPE_LOOKBACK_DAYS)
         
-        for court_id in self.courts:
-            scraped_dates = get_scraped_dates(self.session, court_id)
+        # Convert every day of the range to BS once; shared by all courts
+        nepali_dates = {}
+        current_date = end_date
+        while current_date >= start_date:
+            try:
+                nepali_date = nepalidate.from_date(current_date)
+                nepali_dates[f"{nepali_date.year:04d}-{nepali_date.month:02d}-{nepali_date.day:02d}"] = nepali_date
+            except Exception as e:
+                self.logger.error(f"Error converting date {current_date}: {e}")
+            current_date -= timedelta(days=1)
+        
+        # Take one date from each court in turn; Scrapy pulls requests from here
+        # as the scheduler has room, so only a few of them exist at any time
+        court_requests = [self._bench_list_requests(court_id, nepali_dates) for court_id in self.courts]
+        for requests in zip_longest(*court_requests):
+            for request in requests:
+                if request is not None:
+                    yield request
+
+    def _bench_list_requests(self, court_id, nepali_dates):
+        scraped_dates = get_scraped_dates(self.session, court_id)
+        pending_dates = sorted(nepali_dates.keys() - scraped_dates, reverse=True)
+        
+        self.logger.info(
+            f"Starting scrape for {court_id}, {len(nepali_dates) - len(pending_dates)} dates already processed, "
+            f"{len(pending_dates)} to scrape"
+        )
+        
+        for date_bs in pending_dates:
+            nepali_date = nepali_dates[date_bs]
             
-            self.logger.info(f"Starting scrape for {court_id}, {len(scraped_dates)} dates already processed")
+            pesi_date = f"{nepali_date.year:04d}%2F{nepali_date.month:02d}%2F{nepali_date.day:02d}"
             
-            current_date = end_date
-            while current_date >= start_date:
-                try:
-                    nepali_date = nepalidate.from_date(current_date)
-                    date_bs = f"{nepali_date.year:04d}-{nepali_date.month:02d}-{nepali_date.day:02d}"
-                    
-                    if date_bs in scraped_dates:
-                        self.logger.debug(f"Skipping {court_id} {date_bs} (already processed)")
-                        current_date -= timedelta(days=1)
-                        continue
-                    
-                    pesi_date = f"{nepali_date.year:04d}%2F{nepali_date.month:02d}%2F{nepali_date.day:02d}"
-                    
-                    self.logger.info(f"Processing {court_id} - date: {date_bs}")
-                    
-                    yield scrapy.Request(
-                        url=f"https://supremecourt.gov.np/court/{court_id}/bench_list?pesi_date={pesi_date}",
-                        callback=self.parse_bench_list,
-                        meta={
-                            'court_id': court_id,
-                            'date_bs': date_bs,
-                            'hearing_date': f"{nepali_date.year:04d}{nepali_date.month:02d}{nepali_date.day:02d}"
-                        },
-                        dont_filter=True
-                    )
-                except Exception as e:
-                    self.logger.error(f"Error converting date {current_date} for {court_id}: {e}")
-                
-                current_date -= timedelta(days=1)
+            self.logger.info(f"Processing {court_id} - date: {date_bs}")
+            
+            yield scrapy.Request(
+                url=f"https://supremecourt.gov.np/court/{court_id}/bench_list?pesi_date={pesi_date}",
+                callback=self.parse_bench_list,
+                meta={
+                    'court_id': court_id,
+                    'date_bs': date_bs,
+                    'hearing_date': f"{nepali_date.year:04d}{nepali_date.month:02d}{nepali_date.day:02d}"
+                },
+                dont_filter=True
+            )
 
     def parse_bench_list(self, response):
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         court_id = response.meta['court_id']
         date_bs = response.meta['date_bs']
         hearing_date = response.meta['hearing_date']
         
-        if "The requested URL was rejected" in response.text or "support ID is:" in response.text:
+        # Checked on the raw bytes so blocked responses are never decoded or parsed
+        if b"The requested URL was rejected" in response.body or b"support ID is:" in response.body:
             self.logger.error(f"Request blocked by WAF for {court_id} - {date_bs}")
             return
         
+        soup = BeautifulSoup(response.body, 'lxml', from_encoding=response.encoding)
+        
         bench_table = soup.find('table', class_='table table-striped table-bordered table-hover')
         
         if not bench_table:
             self.logger.info(f"No bench list found for {court_id} - {date_bs}")
-            self._save_cases_and_hearings([], court_id, date_bs, 0)
+            yield self._cause_list_item([], [], court_id, date_bs, bench_count=0)
             return
         
         rows = bench_table.find('tbody').find_all('tr') if bench_table.find('tbody') else []
@@ -125,7 +245,7 @@ class HighCourtCasesSpider(scrapy.Spider):
             
             onclick = row.get('onclick', '')
             if 'send_data' in onclick:
-                match = re.search(r"send_data\('(\d+)',\s*'([^']+)',\s*'(\d+)'\)", onclick)
+                match = SEND_DATA_RE.search(onclick)
                 if match:
                     bench_id = match.group(1)
                     bench_no = match.group(2)
@@ -139,7 +259,7 @@ class HighCourtCasesSpider(scrapy.Spider):
         
         if not benches:
             self.logger.info(f"No benches found for {court_id} - {date_bs}")
-            self._save_cases_and_hearings([], court_id, date_bs, 0)
+            yield self._cause_list_item([], [], court_id, date_bs, bench_count=0)
             return
         
         self.logger.info(f"Found {len(benches)} benches for {court_id} - {date_bs}")
@@ -164,31 +284,30 @@ class HighCourtCasesSpider(scrapy.Spider):
                 dont_filter=True
             )
 
-    def _clean_case_number(self, case_number_cell):
-        for br in case_number_cell.find_all('br'):
-            br.replace_with(' ')
-        case_number = normalize_whitespace(case_number_cell.get_text())
-        cleaned = re.sub(r'\s*\([^)]*\)\s*', '', case_number)
+    def _clean_case_number(self, case_number_text):
+        case_number = normalize_whitespace(case_number_text)
+        cleaned = PARENTHESIZED_RE.sub('', case_number)
         return cleaned.strip()
 
-    def _extract_case_data(self, rows, court_id, date_bs, bench_id, bench_no, bench_type, judge_name) -> List[Tuple[CourtCase, CourtCaseHearing]]:
-        data: List[Tuple[CourtCase, CourtCaseHearing]] = []
+    def _extract_case_data(self, rows, court_id, date_bs, bench_id, bench_no, bench_type, judge_name) -> Tuple[List[Dict], List[Dict]]:
+        cases: List[Dict] = []
+        hearings: List[Dict] = []
         
         bench_no_roman = nepali_to_roman_numerals(bench_no)
+        hearing_date_ad = convert_bs_to_ad(date_bs)
+        scraped_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
         
-        for row in rows:
-            cells = row.find_all('td')
-            
-            if len(cells) < 9:
+        for cells in rows:
+            if cells is None:
                 continue
             
-            serial_no = nepali_to_roman_numerals(normalize_whitespace(cells[0].get_text()))
-            division = normalize_whitespace(cells[1].get_text())
-            registration_date = normalize_date(normalize_whitespace(cells[2].get_text()))
-            case_type = normalize_whitespace(cells[3].get_text())
+            serial_no = nepali_to_roman_numerals(normalize_whitespace(cells[0]))
+            division = normalize_whitespace(cells[1])
+            registration_date = normalize_date(normalize_whitespace(cells[2]))
+            case_type = normalize_whitespace(cells[3])
             case_number = self._clean_case_number(cells[4])
             
-            parties = normalize_whitespace(cells[5].get_text())
+            parties = normalize_whitespace(cells[5])
             plaintiff = ""
             defendant = ""
             if "||" in parties:
@@ -198,83 +317,74 @@ class HighCourtCasesSpider(scrapy.Spider):
             else:
                 plaintiff = parties
             
-            lawyers_text = normalize_whitespace(cells[6].get_text())
+            lawyers_text = normalize_whitespace(cells[6])
             lawyer_names = None if not lawyers_text or lawyers_text == '--' else lawyers_text
             
-            remarks = normalize_whitespace(cells[7].get_text())
+            remarks = normalize_whitespace(cells[7])
             
-            status_cell = cells[8]
-            for br in status_cell.find_all('br'):
-                br.replace_with('\n')
-            status = normalize_whitespace(status_cell.get_text())
+            status = normalize_whitespace(cells[8])
             
             if not case_number:
                 continue
             
-            case = self.case_cache.get(case_number, court_id)
-            if not case:
-                case = CourtCase(
-                    case_number=case_number,
-                    court_identifier=court_id,
-                    registration_date_bs=registration_date,
-                    registration_date_ad=convert_bs_to_ad(registration_date),
-                    case_type=case_type,
-                    division=division,
-                    plaintiff=plaintiff,
-                    defendant=defendant
-                )
-                self.case_cache.set(case)
+            key = (case_number, court_id)
+            case = self.case_rows.get(key)
+            if case is None:
+                case = self.case_rows[key] = {
+                    'case_number': case_number,
+                    'court_identifier': court_id,
+                    'registration_date_bs': registration_date,
+                    'registration_date_ad': convert_bs_to_ad(registration_date),
+                    'case_type': case_type,
+                    'division': division,
+                    'plaintiff': plaintiff,
+                    'defendant': defendant,
+                }
+            cases.append(case)
             
-            hearing = CourtCaseHearing(
-                case_number=case_number,
-                court_identifier=court_id,
-                hearing_date_bs=date_bs,
-                hearing_date_ad=convert_bs_to_ad(date_bs),
-                bench=bench_no_roman,
-                bench_type=bench_type,
-                judge_names=judge_name,
-                lawyer_names=lawyer_names,
-                serial_no=serial_no,
-                case_status=status,
-                remarks=remarks,
-                scraped_at=datetime.now(KATHMANDU_TZ).replace(tzinfo=None),
-                extra_data={
+            hearings.append({
+                'case_number': case_number,
+                'court_identifier': court_id,
+                'hearing_date_bs': date_bs,
+                'hearing_date_ad': hearing_date_ad,
+                'bench': bench_no_roman,
+                'bench_type': bench_type,
+                'judge_names': judge_name,
+                'lawyer_names': lawyer_names,
+                'serial_no': serial_no,
+                'case_status': status,
+                'remarks': remarks,
+                'scraped_at': scraped_at,
+                'extra_data': {
                     'bench_id': bench_id,
                     'bench_no': bench_no
-                }
-            )
-            
-            data.append((case, hearing))
+                },
+            })
         
-        return data
+        return cases, hearings
 
-    def _save_cases_and_hearings(self, data: List[Tuple[CourtCase, CourtCaseHearing]], court_id: str, date_bs: str, bench_count: int):
-        with self.session.begin():
-            for case, hearing in data:
-                self.session.merge(case)
-                self.session.add(hearing)
-            
-            mark_date_scraped(self.session, court_id, date_bs, f"{bench_count} benches")
+    def _cause_list_item(self, cases: List[Dict], hearings: List[Dict], court_id: str, date_bs: str, bench_id: str | None = None, bench_count: int | None = None) -> CauseListItem:
+        return CauseListItem(
+            court_identifier=court_id,
+            date_bs=date_bs,
+            bench_id=bench_id,
+            cases=cases,
+            hearings=hearings,
+            bench_count=bench_count
+        )
 
-    def _handle_bench_completion(self, court_id: str, date_bs: str, total_benches: int, new_data: List[Tuple[CourtCase, CourtCaseHearing]]):
+    def _handle_bench_completion(self, court_id: str, date_bs: str, bench_id: str, total_benches: int, cases: List[Dict], hearings: List[Dict]) -> CauseListItem:
         key = (court_id, date_bs)
         self._bench_counter[key] = self._bench_counter.get(key, 0) + 1
+        date_complete = self._bench_counter[key] >= total_benches
         
-        if self._bench_counter[key] >= total_benches:
-            all_data = self._data_by_date.get(key, [])
-            all_data.extend(new_data)
-            self._save_cases_and_hearings(all_data, court_id, date_bs, total_benches)
-            self.logger.info(f"Saved all cases for {court_id} on {date_bs}")
-            self._data_by_date.pop(key, None)
+        if date_complete:
+            self.logger.info(f"Parsed all cases for {court_id} on {date_bs}")
             self._bench_counter.pop(key, None)  # Clean up counter
-        else:
-            if key not in self._data_by_date:
-                self._data_by_date[key] = []
-            self._data_by_date[key].extend(new_data)
+        
+        return self._cause_list_item(cases, hearings, court_id, date_bs, bench_id, total_benches if date_complete else None)
 
     def parse_cases(self, response):
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         court_id = response.meta['court_id']
         date_bs = response.meta['date_bs']
         bench_id = response.meta['bench_id']
@@ -282,24 +392,23 @@ class HighCourtCasesSpider(scrapy.Spider):
         judge_name = response.meta['judge_name']
         total_benches = response.meta['total_benches']
         
-        bench_type_elem = soup.find('h4', string=lambda x: x and 'इजलास' in x)
-        bench_type = normalize_whitespace(bench_type_elem.get_text()) if bench_type_elem else ""
-        
-        case_table = soup.find('table', class_='table table-bordered table-hover')
+        if response.body.count(b'data_row') > LARGE_CAUSE_LIST_ROWS:
+            bench_type, has_case_table, rows = _stream_cause_list(response.body, response.encoding)
+        else:
+            bench_type, has_case_table, rows = _parse_cause_list(response.selector.root)
+        bench_type = normalize_whitespace(bench_type) if bench_type else ""
         
-        if not case_table:
+        if not has_case_table:
             self.logger.warning(f"No case table found for {court_id} - bench {bench_no} on {date_bs}")
-            self._handle_bench_completion(court_id, date_bs, total_benches, [])
+            yield self._handle_bench_completion(court_id, date_bs, bench_id, total_benches, [], [])
             return
         
-        rows = case_table.find('tbody').find_all('tr', class_='data_row') if case_table.find('tbody') else []
-        
         if not rows:
             self.logger.info(f"No cases found for {court_id} - bench {bench_no} on {date_bs}")
-            self._handle_bench_completion(court_id, date_bs, total_benches, [])
+            yield self._handle_bench_completion(court_id, date_bs, bench_id, total_benches, [], [])
             return
         
-        data = self._extract_case_data(rows, court_id, date_bs, bench_id, bench_no, bench_type, judge_name)
+        cases, hearings = self._extract_case_data(rows, court_id, date_bs, bench_id, bench_no, bench_type, judge_name)
         
-        self.logger.info(f"Extracted {len(data)} cases for {court_id} - bench {bench_no} on {date_bs}")
-        self._handle_bench_completion(court_id, date_bs, total_benches, data)
+        self.logger.info(f"Extracted {len(hearings)} cases for {court_id} - bench {bench_no} on {date_bs}")
+        yield self._handle_bench_completion(court_id, date_bs, bench_id, total_benches, cases, hearings)
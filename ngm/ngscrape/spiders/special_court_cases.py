@@ -1,24 +1,46 @@
 import scrapy
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from scrapy.crawler import CrawlerProcess
 from scrapy.http import FormRequest
-from bs4 import BeautifulSoup
+from lxml import etree
 from nepali.datetime import nepalidate
 import pytz
+from sqlalchemy import delete
 from ngm.utils.normalizer import (
     normalize_whitespace,
     normalize_date,
     nepali_to_roman_numerals,
     fix_parenthesis_spacing,
 )
-from ngm.database.models import get_engine, get_session, init_db, CourtCase, CourtCaseHearing
-from ngm.utils.db_helpers import get_scraped_dates, mark_date_scraped, convert_bs_to_ad, CaseCache
+from ngm.database.models import get_engine, get_session, init_db, CourtCaseHearing
+from ngm.utils.html_text import element_text, element_text_stripped, element_text_with_breaks
+from ngm.utils.db_helpers import get_scraped_dates, mark_date_scraped, save_cases_and_hearings, convert_bs_to_ad
 from ngm.ngscrape.constants import SCRAPE_LOOKBACK_DAYS_SPECIAL_COURT, SCRAPE_OFFSET_DAYS
 
 COURT_ID = "special"
 KATHMANDU_TZ = pytz.timezone('Asia/Kathmandu')
 
+# Bench type dropdown of the daily cause list form, and its hidden "yo" field
+BENCH_SELECT_XPATH = etree.XPath("(//select[@name='bench_type'])[1]")
+YO_VALUE_XPATH = etree.XPath("(//input[@name='yo'][@type='hidden'])[1]/@value")
+
+# Court room heading, e.g. "इजलास नं ३" (the innermost font holding it)
+_COURT_NUMBER_TEXT = "contains(., 'इजलास') and contains(., 'नं')"
+COURT_NUMBER_FONT_XPATH = etree.XPath(f"(//font[{_COURT_NUMBER_TEXT}][not(.//font[{_COURT_NUMBER_TEXT}])])[1]")
+
+# Cell holding the bench's judge lines ("अध्यक्ष/सदस्य माननीय न्यायाधीश ...")
+JUDGES_TD_XPATH = etree.XPath(
+    "(//font[@size='2'][contains(., 'अध्यक्ष माननीय न्यायाधीश') or contains(., 'सदस्य माननीय न्यायाधीश')]"
+    "/ancestor::td[1])[1]"
+)
+
+# Footer (court officer details) is the last borderless full-width table
+FOOTER_TABLE_XPATH = etree.XPath("(//table[@width='100%'][@border='0'])[last()]")
+
+# Cause list table
+CASE_TABLE_XPATH = etree.XPath("(//table[@width='100%'][@border='1'])[1]")
+
 
 class SpecialCourtCasesSpider(scrapy.Spider):
     name = "special_court_cases"
@@ -36,11 +58,11 @@ class SpecialCourtCasesSpider(scrapy.Spider):
         self.engine = get_engine()
         init_db(self.engine)
         self.session = get_session(self.engine)
-        self.case_cache = CaseCache()
+        # First-seen column values of every case, keyed by case number
+        self.case_rows: Dict[str, Dict] = {}
         self.scraped_dates = get_scraped_dates(self.session, COURT_ID)
         self.bench_types_by_date = {}
         self._bench_counter = {}
-        self._data_by_date = {}
 
     def start_requests(self):
         now_ktm = datetime.now(KATHMANDU_TZ)
@@ -86,34 +108,33 @@ class SpecialCourtCasesSpider(scrapy.Spider):
             current_date -= timedelta(days=1)
 
     def parse_bench_types(self, response):
-        soup = BeautifulSoup(response.text, 'html.parser')
+        root = response.selector.root
         
         date_bs = response.meta['date_bs']
         syy = response.meta['syy']
         smm = response.meta['smm']
         sdd = response.meta['sdd']
         
-        bench_select = soup.find('select', {'name': 'bench_type'})
+        bench_selects = BENCH_SELECT_XPATH(root)
         
-        if not bench_select:
+        if not bench_selects:
             self.logger.info(f"No bench types found for date {date_bs}")
-            self._save_cases_and_hearings([], date_bs)
+            self._save_cases_and_hearings([], [], date_bs)
             return
         
-        bench_options = bench_select.find_all('option')
         benches = []
         
-        for option in bench_options:
+        for option in bench_selects[0].iter('option'):
             value = option.get('value', '').strip()
-            label = option.get_text(strip=True)
+            label = element_text_stripped(option)
             if value:
                 benches.append({'value': value, 'label': label})
         
         self.logger.info(f"Found {len(benches)} bench types for date {date_bs}")
         self.bench_types_by_date[date_bs] = len(benches)
         
-        yo_input = soup.find('input', {'name': 'yo', 'type': 'hidden'})
-        yo_value = yo_input.get('value', '1') if yo_input else '1'
+        yo_values = YO_VALUE_XPATH(root)
+        yo_value = yo_values[0] if yo_values else '1'
         
         for bench in benches:
             yield FormRequest(
@@ -139,131 +160,126 @@ class SpecialCourtCasesSpider(scrapy.Spider):
                 dont_filter=True
             )
 
-    def _extract_case_data(self, rows, date_bs, bench_type, bench_label, court_number, judges_text, footer_text) -> List[Tuple[CourtCase, CourtCaseHearing]]:
-        data: List[Tuple[CourtCase, CourtCaseHearing]] = []
+    def _extract_case_data(self, rows, date_bs, bench_type, bench_label, court_number, judges_text, footer_text) -> Tuple[List[Dict], List[Dict]]:
+        cases: List[Dict] = []
+        hearings: List[Dict] = []
+        
+        hearing_date_ad = convert_bs_to_ad(date_bs)
+        scraped_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
         
         for row in rows:
-            cells = row.find_all('td')
+            cells = list(row.iter('td'))
             
             if len(cells) < 11:
                 continue
             
-            serial_no = nepali_to_roman_numerals(normalize_whitespace(cells[0].get_text()))
-            category = normalize_whitespace(cells[1].get_text())
-            registration_date = normalize_date(normalize_whitespace(cells[2].get_text()))
-            case_type = normalize_whitespace(cells[3].get_text())
-            case_number = normalize_whitespace(cells[4].get_text())
-            plaintiff = normalize_whitespace(cells[5].get_text())
-            defendant = normalize_whitespace(cells[6].get_text())
-            original_case_number = fix_parenthesis_spacing(normalize_whitespace(cells[7].get_text()))
-            remarks = normalize_whitespace(cells[8].get_text())
-            case_status = normalize_whitespace(cells[9].get_text())
-            decision_type = normalize_whitespace(cells[10].get_text())
+            serial_no = nepali_to_roman_numerals(normalize_whitespace(element_text(cells[0])))
+            category = normalize_whitespace(element_text(cells[1]))
+            registration_date = normalize_date(normalize_whitespace(element_text(cells[2])))
+            case_type = normalize_whitespace(element_text(cells[3]))
+            case_number = normalize_whitespace(element_text(cells[4]))
+            plaintiff = normalize_whitespace(element_text(cells[5]))
+            defendant = normalize_whitespace(element_text(cells[6]))
+            original_case_number = fix_parenthesis_spacing(normalize_whitespace(element_text(cells[7])))
+            remarks = normalize_whitespace(element_text(cells[8]))
+            case_status = normalize_whitespace(element_text(cells[9]))
+            decision_type = normalize_whitespace(element_text(cells[10]))
             
             if not case_number:
                 continue
             
             judge_names = '\n'.join([normalize_whitespace(line) for line in judges_text.split('\n') if line.strip()]) if judges_text else None
             
-            case = self.case_cache.get(case_number, COURT_ID)
-            if not case:
-                case = CourtCase(
-                    case_number=case_number,
-                    court_identifier=COURT_ID,
-                    registration_date_bs=registration_date,
-                    registration_date_ad=convert_bs_to_ad(registration_date),
-                    case_type=case_type,
-                    category=category,
-                    plaintiff=plaintiff,
-                    defendant=defendant,
-                    original_case_number=original_case_number
-                )
-                self.case_cache.set(case)
+            case = self.case_rows.get(case_number)
+            if case is None:
+                case = self.case_rows[case_number] = {
+                    'case_number': case_number,
+                    'court_identifier': COURT_ID,
+                    'registration_date_bs': registration_date,
+                    'registration_date_ad': convert_bs_to_ad(registration_date),
+                    'case_type': case_type,
+                    'category': category,
+                    'plaintiff': plaintiff,
+                    'defendant': defendant,
+                    'original_case_number': original_case_number,
+                }
+            cases.append(case)
             
-            hearing = CourtCaseHearing(
-                case_number=case_number,
-                court_identifier=COURT_ID,
-                hearing_date_bs=date_bs,
-                hearing_date_ad=convert_bs_to_ad(date_bs),
-                bench_type=bench_type,
-                serial_no=serial_no,
-                judge_names=judge_names,
-                case_status=case_status,
-                decision_type=decision_type,
-                remarks=remarks,
-                scraped_at=datetime.now(KATHMANDU_TZ).replace(tzinfo=None),
-                extra_data={
+            hearings.append({
+                'case_number': case_number,
+                'court_identifier': COURT_ID,
+                'hearing_date_bs': date_bs,
+                'hearing_date_ad': hearing_date_ad,
+                'bench_type': bench_type,
+                'serial_no': serial_no,
+                'judge_names': judge_names,
+                'case_status': case_status,
+                'decision_type': decision_type,
+                'remarks': remarks,
+                'scraped_at': scraped_at,
+                'extra_data': {
                     'bench_label': normalize_whitespace(bench_label),
                     'court_number': court_number,
                     'footer': footer_text
-                }
-            )
-            
-            data.append((case, hearing))
+                },
+            })
         
-        return data
+        return cases, hearings
     
-    def _save_cases_and_hearings(self, data: List[Tuple[CourtCase, CourtCaseHearing]], date_bs: str):
+    def _save_cases_and_hearings(self, cases: List[Dict], hearings: List[Dict], date_bs: str, bench_type: str | None = None, date_complete: bool = True):
         with self.session.begin():
-            for case, hearing in data:
-                self.session.merge(case)
-                self.session.add(hearing)
+            # Replace hearings an earlier run left for this bench type if it stopped before marking the date
+            if bench_type is not None:
+                self.session.execute(
+                    delete(CourtCaseHearing).where(
+                        CourtCaseHearing.court_identifier == COURT_ID,
+                        CourtCaseHearing.hearing_date_bs == date_bs,
+                        CourtCaseHearing.bench_type == bench_type,
+                    )
+                )
+            save_cases_and_hearings(self.session, cases, hearings)
             
-            bench_count = self.bench_types_by_date.get(date_bs, 0)
-            mark_date_scraped(self.session, COURT_ID, date_bs, f"{bench_count} benches")
+            if date_complete:
+                bench_count = self.bench_types_by_date.get(date_bs, 0)
+                mark_date_scraped(self.session, COURT_ID, date_bs, f"{bench_count} benches")
 
-    def _handle_bench_completion(self, date_bs: str, total_benches: int, new_data: List[Tuple[CourtCase, CourtCaseHearing]]):
+    def _handle_bench_completion(self, date_bs: str, bench_type: str, total_benches: int, cases: List[Dict], hearings: List[Dict]):
         self._bench_counter[date_bs] = self._bench_counter.get(date_bs, 0) + 1
+        date_complete = self._bench_counter[date_bs] >= total_benches
+        
+        self._save_cases_and_hearings(cases, hearings, date_bs, bench_type, date_complete)
         
-        if self._bench_counter[date_bs] >= total_benches:
-            all_data = self._data_by_date.get(date_bs, [])
-            all_data.extend(new_data)
-            self._save_cases_and_hearings(all_data, date_bs)
+        if date_complete:
             self.logger.info(f"Saved all cases for date {date_bs}")
-            self._data_by_date.pop(date_bs, None)
-        else:
-            if date_bs not in self._data_by_date:
-                self._data_by_date[date_bs] = []
-            self._data_by_date[date_bs].extend(new_data)
+            self._bench_counter.pop(date_bs, None)
 
     def parse_cases(self, response):
-        soup = BeautifulSoup(response.text, 'html.parser')
+        root = response.selector.root
         
         date_bs = response.meta['date_bs']
         bench_type = response.meta['bench_type']
         bench_label = response.meta['bench_label']
         total_benches = response.meta['total_benches']
         
-        court_number_elem = soup.find('font', string=lambda x: x and 'इजलास' in x and 'नं' in x)
-        court_number = normalize_whitespace(court_number_elem.get_text()) if court_number_elem else ""
+        court_number_elems = COURT_NUMBER_FONT_XPATH(root)
+        court_number = normalize_whitespace(element_text(court_number_elems[0])) if court_number_elems else ""
         
-        judges_text = ""
-        for font_tag in soup.find_all('font', {'size': '2'}):
-            text = font_tag.get_text(strip=True)
-            if 'अध्यक्ष माननीय न्यायाधीश' in text or 'सदस्य माननीय न्यायाधीश' in text:
-                parent_td = font_tag.find_parent('td')
-                if parent_td:
-                    for br in parent_td.find_all('br'):
-                        br.replace_with('\n')
-                    judges_text = parent_td.get_text()
-                    break
+        judges_tds = JUDGES_TD_XPATH(root)
+        judges_text = element_text_with_breaks(judges_tds[0], '\n') if judges_tds else ""
         
-        footer_text = ""
-        all_tables = soup.find_all('table', {'width': '100%', 'border': '0'})
-        if all_tables:
-            footer_table = all_tables[-1]
-            footer_text = normalize_whitespace(footer_table.get_text())
+        footer_tables = FOOTER_TABLE_XPATH(root)
+        footer_text = normalize_whitespace(element_text(footer_tables[0])) if footer_tables else ""
         
-        case_table = soup.find('table', {'width': '100%', 'border': '1'})
+        case_tables = CASE_TABLE_XPATH(root)
         
-        if not case_table:
+        if not case_tables:
             self.logger.warning(f"No case table found for bench {bench_type} on {date_bs}")
-            self._handle_bench_completion(date_bs, total_benches, [])
+            self._handle_bench_completion(date_bs, bench_type, total_benches, [], [])
             return
         
-        rows = case_table.find_all('tr')[1:]
-        data = self._extract_case_data(rows, date_bs, bench_type, bench_label, court_number, judges_text, footer_text)
+        rows = list(case_tables[0].iter('tr'))[1:]
+        cases, hearings = self._extract_case_data(rows, date_bs, bench_type, bench_label, court_number, judges_text, footer_text)
         
-        self.logger.info(f"Extracted {len(data)} cases for bench {bench_type} on {date_bs}")
-        self._handle_bench_completion(date_bs, total_benches, data)
+        self.logger.info(f"Extracted {len(hearings)} cases for bench {bench_type} on {date_bs}")
+        self._handle_bench_completion(date_bs, bench_type, total_benches, cases, hearings)
 
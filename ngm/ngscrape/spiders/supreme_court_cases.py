@@ -180,6 +180,7 @@ class SupremeCourtCasesSpider(scrapy.Spider):
     def _extract_case_data(self, rows, date_bs) -> List[Tuple[CourtCase, CourtCaseHearing]]:
         """Extract and construct SQLAlchemy objects from table rows."""
         data: List[Tuple[CourtCase, CourtCaseHearing]] = []
+        scraped_at = datetime.now(KATHMANDU_TZ).replace(tzinfo=None)
 
         for row in rows:
             cells = row.find_all('td')
@@ -234,7 +235,7 @@ class SupremeCourtCasesSpider(scrapy.Spider):
                 serial_no=serial_no,
                 remarks=remarks,
                 judge_names=judges_must_hear,
-                scraped_at=datetime.now(KATHMANDU_TZ).replace(tzinfo=None),
+                scraped_at=scraped_at,
                 extra_data={
                     'judges_cannot_hear': judges_cannot_hear,
                     'judges_must_hear': judges_must_hear
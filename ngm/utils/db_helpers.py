@@ -1,15 +1,19 @@
 """Database helper functions for court case scrapers."""
 
 from datetime import datetime, date
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from nepali.datetime import nepalidate
+from sqlalchemy import insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from ngm.database.models import CourtCase, CourtCaseHearing, CourtScrapedDate
 import logging
 
 
+@lru_cache(maxsize=8192)
 def convert_bs_to_ad(date_bs: str) -> date | None:
-    """Convert BS date string to AD date object."""
+    """Convert BS date string to AD date object (memoized; dates recur across hearings)."""
     if not date_bs:
         return None
     try:
@@ -28,10 +32,9 @@ def convert_bs_to_ad(date_bs: str) -> date | None:
 def get_scraped_dates(session: Session, court_id: str) -> set[str]:
     """Get all scraped dates (BS format) for a court."""
     with session.begin():
-        results = session.query(CourtScrapedDate.date_bs).filter_by(
-            court_identifier=court_id
-        ).all()
-        return {row[0] for row in results}
+        return set(session.scalars(
+            select(CourtScrapedDate.date_bs).where(CourtScrapedDate.court_identifier == court_id)
+        ))
 
 
 def mark_date_scraped(session: Session, court_id: str, date_bs: str, data: str = None):
@@ -44,10 +47,42 @@ def mark_date_scraped(session: Session, court_id: str, date_bs: str, data: str =
     session.add(scraped)
 
 
+def save_cases_and_hearings(session: Session, cases: List[Dict], hearings: List[Dict]):
+    """
+    Upsert the cases and insert the hearings of a batch, one statement each.
+    
+    Both are lists of column dicts; a case listed more than once is written
+    with its first values. Cases already in the database get the scraped
+    columns overwritten, like session.merge() would, but rows whose values did
+    not change are left alone.
+    """
+    if not hearings:
+        return
+    
+    unique_cases = {}
+    for case in cases:
+        unique_cases.setdefault((case['case_number'], case['court_identifier']), case)
+    case_rows = list(unique_cases.values())
+    
+    table = CourtCase.__table__
+    update_columns = [key for key in case_rows[0] if key not in ('case_number', 'court_identifier')]
+    stmt = pg_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.case_number, table.c.court_identifier],
+        set_={**{key: stmt.excluded[key] for key in update_columns}, 'updated_at': datetime.utcnow()},
+        where=or_(*(table.c[key].is_distinct_from(stmt.excluded[key]) for key in update_columns)),
+    )
+    session.execute(stmt, case_rows)
+    
+    session.execute(insert(CourtCaseHearing.__table__), hearings)
+
+
 class CaseCache:
     """Cache for CourtCase objects to avoid repeated DB queries."""
     
     def __init__(self):
+        # Tuple keys hash from the strings' cached hashes; a concatenated string
+        # key would have to be built and hashed anew on every lookup
         self._cache: Dict[Tuple[str, str], CourtCase] = {}
     
     def get(self, case_number: str, court_id: str) -> CourtCase | None:
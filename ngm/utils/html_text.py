@@ -0,0 +1,25 @@
+"""Text extraction helpers for lxml elements."""
+
+from lxml import etree
+
+# Text nodes and <br> elements below an element, in document order
+_TEXT_AND_BR_XPATH = etree.XPath('.//text() | .//br')
+
+
+def element_text(element) -> str:
+    """Concatenate the text of an element (same as BeautifulSoup's get_text())."""
+    return ''.join(element.itertext())
+
+
+def element_text_stripped(element) -> str:
+    """Concatenate stripped text fragments (same as BeautifulSoup's get_text(strip=True))."""
+    return ''.join(fragment.strip() for fragment in element.itertext())
+
+
+def element_text_with_breaks(element, separator: str) -> str:
+    """
+    Concatenate the text of an element, replacing each <br> with separator.
+    
+    Reads text nodes and <br> elements in one XPath pass; the tree is not modified.
+    """
+    return ''.join(node if isinstance(node, str) else separator for node in _TEXT_AND_BR_XPATH(element))
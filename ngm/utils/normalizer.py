@@ -4,32 +4,29 @@ def normalize_whitespace(text):
     """Normalize all Unicode whitespace characters to regular spaces and clean up"""
     if not text:
         return ""
-    # Replace all Unicode whitespace with regular space, then clean up
-    # This regex matches all Unicode whitespace characters
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+    # Collapse runs of Unicode whitespace to a single space and trim the ends
+    # (str.split() splits on exactly the characters the regex \s matches)
+    text = ' '.join(text.split())
     # Strip surrounding quotes if present (sometimes HTML has stray quotes)
     text = text.strip('"\'')
     # Return empty string if only whitespace remained
     return text if text.strip() else ""
 
 
+# Translation table of Nepali digits to Roman digits
+NEPALI_TO_ROMAN_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+
+
 def nepali_to_roman_numerals(text):
     """Convert Nepali numerals (Devanagari digits) to Roman numerals"""
     if not text:
         return text
     
-    # Mapping of Nepali digits to Roman digits
-    nepali_to_roman = {
-        '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
-        '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
-    }
-    
-    result = text
-    for nepali, roman in nepali_to_roman.items():
-        result = result.replace(nepali, roman)
-    
-    return result
+    return text.translate(NEPALI_TO_ROMAN_DIGITS)
+
+
+# Translation table of Roman digits to Nepali digits
+ROMAN_TO_NEPALI_DIGITS = str.maketrans('0123456789', '०१२३४५६७८९')
 
 
 def roman_to_nepali_numerals(text):
@@ -37,17 +34,7 @@ def roman_to_nepali_numerals(text):
     if not text:
         return text
     
-    # Mapping of Roman digits to Nepali digits
-    roman_to_nepali = {
-        '0': '०', '1': '१', '2': '२', '3': '३', '4': '४',
-        '5': '५', '6': '६', '7': '७', '8': '८', '9': '९'
-    }
-    
-    result = text
-    for roman, nepali in roman_to_nepali.items():
-        result = result.replace(roman, nepali)
-    
-    return result
+    return text.translate(ROMAN_TO_NEPALI_DIGITS)
 
 
 def normalize_date(date_str):
@@ -103,7 +90,6 @@ def fix_parenthesis_spacing(text):
     if not text:
         return text
     
-    import re
     # Add space before opening parenthesis if missing
     text = re.sub(r'(\S)\(', r'\1 (', text)
     # Remove space after opening parenthesis